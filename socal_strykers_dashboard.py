@@ -9,97 +9,173 @@ import base64
 from pathlib import Path
 import os
 
+import strykers_store as store
+from strykers_metrics import MetricGraph
+from strykers_demand import effects
+from strykers_trends import svg_line_chart
+from strykers_regression import format_p_value
+
 # Load data
 print("Loading data from data.csv...")
 print(f"Current directory: {os.getcwd()}")
 
-# Try to find data.csv
-if os.path.exists('data.csv'):
-    df = pd.read_csv('data.csv')
-elif os.path.exists('/mnt/user-data/uploads/SoCal_Strykers_Secondary_Ticket_Sales_Secondary_Tix_Transaction_Data_.csv'):
-    print("Note: Using full dataset path")
-    df = pd.read_csv('/mnt/user-data/uploads/SoCal_Strykers_Secondary_Ticket_Sales_Secondary_Tix_Transaction_Data_.csv')
-else:
-    raise FileNotFoundError("Could not find data.csv. Please run this script from the directory containing data.csv")
-
-# Clean data
-df['Total_Revenue'] = df['Total Block Price'].str.replace('$', '', regex=False).str.replace(',', '').astype(float)
-df['Seats'] = df['Number of Seats']
-df['Event_Date'] = pd.to_datetime(df['Event Date'], format='%m/%d/%Y', errors='coerce')
-df['Sale_Date'] = pd.to_datetime(df['Sale Date'], format='%m/%d/%Y', errors='coerce')
-df['Days_Before_Game'] = (df['Event_Date'] - df['Sale_Date']).dt.days
-
-def categorize_customer(days):
-    if pd.isna(days):
-        return 'Unknown'
-    if days >= 15:
-        return 'Planner'
-    elif days >= 3:
-        return 'In-Between'
-    else:
-        return 'Last-Minute'
+# Shared transaction store (ingested once from the cleaned, revenue-normalized CSV)
+conn = store.open_store()
 
-df['Customer_Type'] = df['Days_Before_Game'].apply(categorize_customer)
+# Metrics are evaluated lazily through the metric graph; unchanged nodes come from the cache
+metrics = MetricGraph(conn)
 
 # Calculate metrics
-baseline_revenue = df['Total_Revenue'].sum()
-baseline_seats = df['Seats'].sum()
-baseline_atp = baseline_revenue / baseline_seats
-total_games = 31
-
-# Filter for known customer types
-known_df = df[df['Customer_Type'] != 'Unknown']
+baseline_revenue = metrics['baseline']['revenue']
+baseline_seats = metrics['baseline']['seats']
+baseline_atp = metrics['baseline']['atp']
+total_games = metrics['total_games']
 
-# Calculate customer type ATPs
-planner_data = known_df[known_df['Customer_Type'] == 'Planner']
-planner_atp = planner_data['Total_Revenue'].sum() / planner_data['Seats'].sum()
-planner_seats = planner_data['Seats'].sum()
+# Customer type ATPs (known customer types only)
+planner = metrics['customer_types']['Planner']
+planner_atp, planner_seats = planner['atp'], planner['seats']
 
-inbetween_data = known_df[known_df['Customer_Type'] == 'In-Between']
-inbetween_atp = inbetween_data['Total_Revenue'].sum() / inbetween_data['Seats'].sum()
-inbetween_seats = inbetween_data['Seats'].sum()
+inbetween = metrics['customer_types']['In-Between']
+inbetween_atp, inbetween_seats = inbetween['atp'], inbetween['seats']
 
-lastmin_data = known_df[known_df['Customer_Type'] == 'Last-Minute']
-lastmin_atp = lastmin_data['Total_Revenue'].sum() / lastmin_data['Seats'].sum()
-lastmin_seats = lastmin_data['Seats'].sum()
-lastmin_revenue = lastmin_data['Total_Revenue'].sum()
+lastmin = metrics['customer_types']['Last-Minute']
+lastmin_atp, lastmin_seats, lastmin_revenue = lastmin['atp'], lastmin['seats'], lastmin['revenue']
 
-# Initiative calculations
 # Initiative 1
-target_lastmin_atp = planner_atp * 0.75
-retention = 0.90
-new_lastmin_seats = lastmin_seats * retention
-new_lastmin_revenue = new_lastmin_seats * target_lastmin_atp
-revenue_change_1 = new_lastmin_revenue - lastmin_revenue
+retention = metrics['retention']
+target_lastmin_atp = metrics['initiative_1']['target_atp']
+new_lastmin_seats = metrics['initiative_1']['new_seats']
+new_lastmin_revenue = metrics['initiative_1']['new_revenue']
+revenue_change_1 = metrics['initiative_1']['revenue_change']
 
 # Initiative 2
-seats_converting_a = inbetween_seats * 0.20
-atp_increase_a = planner_atp - inbetween_atp
-revenue_increase_a = seats_converting_a * atp_increase_a
-
-seats_converting_b = lastmin_seats * 0.20
-atp_increase_b = inbetween_atp - lastmin_atp
-revenue_increase_b = seats_converting_b * atp_increase_b
-revenue_change_2 = revenue_increase_a + revenue_increase_b
+seats_converting_a = metrics['initiative_2']['seats_converting_a']
+atp_increase_a = metrics['initiative_2']['atp_increase_a']
+revenue_increase_a = metrics['initiative_2']['revenue_increase_a']
+seats_converting_b = metrics['initiative_2']['seats_converting_b']
+atp_increase_b = metrics['initiative_2']['atp_increase_b']
+revenue_increase_b = metrics['initiative_2']['revenue_increase_b']
+revenue_change_2 = metrics['initiative_2']['revenue_change']
 
 # Initiative 3
-avg_attendance = 1922
-eligible_pct = 0.798
-take_rate = 1/3
-upgrade_price = 10
-eligible_per_game = avg_attendance * eligible_pct
-upgrades_per_game = eligible_per_game * take_rate
-revenue_per_game = upgrades_per_game * upgrade_price
-revenue_change_3 = revenue_per_game * total_games
+avg_attendance = metrics['avg_attendance']
+upgrade_price = metrics['upgrade_price']
+eligible_per_game = metrics['initiative_3']['eligible_per_game']
+upgrades_per_game = metrics['initiative_3']['upgrades_per_game']
+revenue_per_game = metrics['initiative_3']['revenue_per_game']
+revenue_change_3 = metrics['initiative_3']['revenue_change']
 
 # Total
-total_increase = revenue_change_1 + revenue_change_2 + revenue_change_3
-new_revenue = baseline_revenue + total_increase
+total_increase = metrics['total_increase']
+new_revenue = metrics['new_revenue']
+
+# Promotion comparison
+promo_by_type = metrics['promotion']['by_type']
+promo_atp = metrics['promotion']['promo_atp']
+non_promo_atp = metrics['promotion']['non_promo_atp']
+promo_games = metrics['promotion']['promo_games']
+non_promo_games = metrics['promotion']['non_promo_games']
+promo_atp_lift = metrics['promotion']['atp_lift']
+returned_blocks = metrics['returns']['blocks']
+returned_revenue = metrics['returns']['revenue']
+
+# Trend analytics (rolling windows over sale date and event date)
+sale_trends = metrics['sale_date_trends']['rolling']
+event_daily = metrics['event_date_trends']['daily']
+event_trends = metrics['event_date_trends']['rolling'][event_daily['seats'] > 0]
+sell_through = metrics['sell_through']
+seasons = metrics['seasons']
+
+# Demand model (per-game revenue on opponent, weekday, promotion and days-out mix)
+demand_model = metrics['demand_model']
+weekday_effects = effects(demand_model, 'weekday')
+opponent_effects = effects(demand_model, 'opponent')
+
+# Regression model
+model = metrics['price_model']
+coef = model['coef']
+p_values = model['p_values']
+conn.close()
 
 print(f"Baseline Revenue: ${baseline_revenue:,.2f}")
 print(f"Total Increase: ${total_increase:,.2f}")
 print(f"New Revenue: ${new_revenue:,.2f}")
 
+def format_coef(value):
+    """Signed dollar coefficient, e.g. -$613.24"""
+    return f"{'+' if value >= 0 else '-'}${abs(value):,.2f}"
+
+# Regression equation lines (intercept first, then each term with its sign)
+equation_lines = [f"Price = {coef['Intercept']:.2f} (Intercept)"]
+for term, value in list(coef.items())[1:]:
+    label = f"({term})" if '×' in term else term
+    equation_lines.append(f"        &nbsp;&nbsp;&nbsp;&nbsp;{'+' if value >= 0 else '-'} {abs(value):.2f} × {label}")
+regression_equation = '<br>\n'.join(equation_lines)
+
+# Giveaway-type breakdown rows
+promotion_rows = '\n'.join(
+    f"""                    <tr>
+                        <td>{giveaway}</td>
+                        <td>{int(row['Games'])}</td>
+                        <td>${row['ATP']:.2f}</td>
+                        <td>${row['Revenue_Per_Game']:,.0f}</td>
+                    </tr>"""
+    for giveaway, row in promo_by_type.iterrows()
+)
+
+# Trend charts (inline SVG with hover tooltips)
+trend_charts = [
+    svg_line_chart({'7-day': sale_trends['atp_7d'], '28-day': sale_trends['atp_28d']},
+                   'Rolling ATP by Sale Date', '${:,.2f}'),
+    svg_line_chart({ctype: sale_trends[f"mix_{ctype}_28d"] for ctype in ['Planner', 'In-Between', 'Last-Minute']},
+                   'Customer-Type Mix by Sale Date (28-day)', '{:.0%}'),
+    svg_line_chart({'7-day': event_trends['atp_7d'], '28-day': event_trends['atp_28d']},
+                   'Rolling ATP by Event Date (game days)', '${:,.2f}'),
+    svg_line_chart({f"{season} season": sell_through[season] for season in sell_through.columns},
+                   'Sell-Through Pacing (share of season seats sold)', '{:.0%}', 'Days before season opener'),
+]
+trend_chart_cards = '\n'.join(
+    f"""                <div class="image-card">
+                    {chart}
+                </div>"""
+    for chart in trend_charts
+)
+
+# Season-over-season rows
+# The last row is the 'change' from the first to the last season
+first_season, last_season = seasons.index[0], seasons.index[-2]
+season_rows = '\n'.join(
+    f"""                    <tr>
+                        <td>{label}</td>
+                        <td>{fmt.format(seasons.loc[first_season, column])}</td>
+                        <td>{fmt.format(seasons.loc[last_season, column])}</td>
+                        <td>{seasons.loc['change', column]:+.1%}</td>
+                    </tr>"""
+    for label, column, fmt in [
+        ('Revenue', 'revenue', '${:,.0f}'),
+        ('Seats', 'seats', '{:,.0f}'),
+        ('Games', 'games', '{:.0f}'),
+        ('ATP', 'atp', '${:.2f}'),
+        ('Revenue / Game', 'revenue_per_game', '${:,.0f}'),
+        ('Planner Mix', 'mix_Planner', '{:.1%}'),
+        ('In-Between Mix', 'mix_In-Between', '{:.1%}'),
+        ('Last-Minute Mix', 'mix_Last-Minute', '{:.1%}'),
+    ]
+)
+
+# Demand model effect rows (weekdays, and the five strongest and weakest opponents)
+def effect_rows(effect_series):
+    return '\n'.join(
+        f"""                    <tr>
+                        <td>{level}</td>
+                        <td class="highlight">{'+' if value >= 0 else '-'}${abs(value):,.0f}</td>
+                    </tr>"""
+        for level, value in effect_series.items()
+    )
+
+weekday_rows = effect_rows(weekday_effects)
+opponent_rows = effect_rows(pd.concat([opponent_effects.head(5), opponent_effects.tail(5)]))
+
 # Function to encode image to base64
 def encode_image(image_path):
     """Encode image file to base64 string"""
@@ -387,6 +463,11 @@ html_content = f"""
             margin-bottom: 10px;
         }}
         
+        .trend-chart {{
+            width: 100%;
+            height: auto;
+        }}
+        
         .image-title {{
             text-align: center;
             font-size: 1.1em;
@@ -465,6 +546,10 @@ html_content = f"""
                     <div class="metric-value">{total_games}</div>
                 </div>
             </div>
+            
+            <div class="note">
+                <strong>Revenue Basis:</strong> Fee-exclusive prices, net of {returned_blocks} returned blocks (${returned_revenue:,.0f} removed)
+            </div>
         </div>
 
         <!-- Regression Model Analysis -->
@@ -479,35 +564,26 @@ html_content = f"""
             <div class="metric-grid">
                 <div class="metric-card">
                     <div class="metric-label">R-squared</div>
-                    <div class="metric-value">19.84%</div>
+                    <div class="metric-value">{model['r_squared']*100:.2f}%</div>
                 </div>
                 <div class="metric-card">
                     <div class="metric-label">F-statistic</div>
-                    <div class="metric-value">474.30</div>
+                    <div class="metric-value">{model['f_stat']:.2f}</div>
                 </div>
                 <div class="metric-card">
                     <div class="metric-label">p-value</div>
-                    <div class="metric-value">< 0.001</div>
+                    <div class="metric-value">{format_p_value(model['f_p_value']).rstrip(' *')}</div>
                 </div>
                 <div class="metric-card">
                     <div class="metric-label">Sample Size</div>
-                    <div class="metric-value">23,006</div>
+                    <div class="metric-value">{model['n_obs']:,}</div>
                 </div>
             </div>
             
             <h3>Regression Equation</h3>
             <div class="model-equation">
                 <div class="equation">
-Price = 79.12 (Intercept)<br>
-        &nbsp;&nbsp;&nbsp;&nbsp;- 21.41 × In-Between<br>
-        &nbsp;&nbsp;&nbsp;&nbsp;- 49.04 × Last-Minute<br>
-        &nbsp;&nbsp;&nbsp;&nbsp;+ 45.03 × Lower_Goal_Line<br>
-        &nbsp;&nbsp;&nbsp;&nbsp;+ 226.67 × Lower_Sideline<br>
-        &nbsp;&nbsp;&nbsp;&nbsp;+ 723.96 × Pitchside<br>
-        &nbsp;&nbsp;&nbsp;&nbsp;+ 81.35 × Promotion<br>
-        &nbsp;&nbsp;&nbsp;&nbsp;- 134.95 × (Last-Minute × Lower_Sideline)<br>
-        &nbsp;&nbsp;&nbsp;&nbsp;- 613.24 × (Last-Minute × Pitchside)<br>
-        &nbsp;&nbsp;&nbsp;&nbsp;+ 124.45 × (In-Between × Pitchside)
+{regression_equation}
                 </div>
             </div>
             
@@ -524,20 +600,20 @@ Price = 79.12 (Intercept)<br>
                 <tbody>
                     <tr>
                         <td>Last-Minute × Pitchside</td>
-                        <td class="highlight">-$613.24</td>
-                        <td>< 0.001 ***</td>
+                        <td class="highlight">{format_coef(coef['Last-Minute × Pitchside'])}</td>
+                        <td>{format_p_value(p_values['Last-Minute × Pitchside'])}</td>
                         <td>Pitchside loses 59% of value for last-minute buyers</td>
                     </tr>
                     <tr>
                         <td>Last-Minute × Lower Sideline</td>
-                        <td class="highlight">-$134.95</td>
-                        <td>< 0.001 ***</td>
+                        <td class="highlight">{format_coef(coef['Last-Minute × Lower_Sideline'])}</td>
+                        <td>{format_p_value(p_values['Last-Minute × Lower_Sideline'])}</td>
                         <td>Extra discount on premium sideline seats</td>
                     </tr>
                     <tr>
                         <td>In-Between × Pitchside</td>
-                        <td class="highlight">+$124.45</td>
-                        <td>0.018 *</td>
+                        <td class="highlight">{format_coef(coef['In-Between × Pitchside'])}</td>
+                        <td>{format_p_value(p_values['In-Between × Pitchside'])}</td>
                         <td>Sweet spot: 3-14 days before game</td>
                     </tr>
                 </tbody>
@@ -690,6 +766,123 @@ Combined total:        ${revenue_change_2:,.2f}</pre>
             </table>
         </div>
 
+        <!-- Promotion Analysis -->
+        <div class="section">
+            <h2>Promotion Analysis</h2>
+            <div class="metric-grid">
+                <div class="metric-card">
+                    <div class="metric-label">Promotion ATP ({promo_games} games)</div>
+                    <div class="metric-value">${promo_atp:.2f}</div>
+                </div>
+                <div class="metric-card">
+                    <div class="metric-label">Non-Promotion ATP ({non_promo_games} games)</div>
+                    <div class="metric-value">${non_promo_atp:.2f}</div>
+                </div>
+                <div class="metric-card">
+                    <div class="metric-label">Promotion ATP Lift</div>
+                    <div class="metric-value">{promo_atp_lift:+.1%}</div>
+                </div>
+                <div class="metric-card">
+                    <div class="metric-label">Promotion Coefficient</div>
+                    <div class="metric-value">{format_coef(coef['Promotion'])}</div>
+                </div>
+            </div>
+            
+            <table>
+                <thead>
+                    <tr>
+                        <th>Giveaway</th>
+                        <th>Games</th>
+                        <th>ATP</th>
+                        <th>Revenue / Game</th>
+                    </tr>
+                </thead>
+                <tbody>
+{promotion_rows}
+                </tbody>
+            </table>
+        </div>
+
+        <!-- Trend Analytics -->
+        <div class="section">
+            <h2>Trend Analytics</h2>
+            <div class="image-grid">
+{trend_chart_cards}
+            </div>
+            
+            <h3>Season over Season</h3>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Metric</th>
+                        <th>{first_season}</th>
+                        <th>{last_season}</th>
+                        <th>Change</th>
+                    </tr>
+                </thead>
+                <tbody>
+{season_rows}
+                </tbody>
+            </table>
+            
+            <div class="note">
+                <strong>Note:</strong> Rolling windows are trailing 7 and 28 calendar days; hover a point for its value and click a legend entry to hide a series
+            </div>
+        </div>
+
+        <!-- Demand Model -->
+        <div class="section">
+            <h2>Demand Model</h2>
+            <div class="metric-grid">
+                <div class="metric-card">
+                    <div class="metric-label">R-squared</div>
+                    <div class="metric-value">{demand_model['r_squared']*100:.2f}%</div>
+                </div>
+                <div class="metric-card">
+                    <div class="metric-label">Games</div>
+                    <div class="metric-value">{demand_model['n_games']}</div>
+                </div>
+                <div class="metric-card">
+                    <div class="metric-label">Avg Revenue / Game</div>
+                    <div class="metric-value">${metrics['event_features']['revenue'].mean():,.0f}</div>
+                </div>
+                <div class="metric-card">
+                    <div class="metric-label">Promotion Effect</div>
+                    <div class="metric-value">{format_coef(demand_model['coef']['promotion'])}</div>
+                </div>
+            </div>
+            
+            <h3>Day-of-Week Effects</h3>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Weekday</th>
+                        <th>Revenue / Game Effect</th>
+                    </tr>
+                </thead>
+                <tbody>
+{weekday_rows}
+                </tbody>
+            </table>
+            
+            <h3>Opponent Effects (Top and Bottom 5)</h3>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Opponent</th>
+                        <th>Revenue / Game Effect</th>
+                    </tr>
+                </thead>
+                <tbody>
+{opponent_rows}
+                </tbody>
+            </table>
+            
+            <div class="note">
+                <strong>Model:</strong> Ridge regression (alpha = {demand_model['alpha']:g}) of per-game revenue on one-hot opponent, weekday and season type, promotion and days-out seat mix. Doubleheaders count as separate games; effects are shrunk toward zero by the penalty.
+            </div>
+        </div>
+
         <!-- Data Visualizations -->
         <div class="section">
             <h2>Data Visualizations</h2>
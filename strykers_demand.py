@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+SoCal Strykers Demand Model
+Ridge-regularized linear model of per-game revenue on an event-level feature matrix:
+one-hot opponent, weekday and season type, promotion flag and the days-out seat mix.
+
+Categoricals are encoded as a scipy sparse matrix and the model is fit with LSQR on a
+centered linear operator, so neither the design matrix nor X'X is ever densified and
+fitting scales to multi-league schedules with thousands of opponents.
+
+Requires scipy (imported when a model is built or applied), which makes scipy a dependency
+of the dashboard's Demand Model section and the golden snapshot. The rest of the metric
+graph and the store CLI still need only pandas and numpy.
+
+    python strykers_demand.py                      # fit and show the largest effects
+    python strykers_demand.py schedule.csv         # predict revenue for upcoming games
+"""
+
+import argparse
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+# Ridge penalty on every coefficient except the intercept
+ALPHA = 1.0
+
+GAME_KEYS = ['event_date', 'opponent']
+CATEGORICAL_FEATURES = ['opponent', 'weekday', 'season_type']
+# Planner share is the omitted days-out category (the three shares sum to 1)
+NUMERIC_FEATURES = ['promotion', 'mix_In-Between', 'mix_Last-Minute']
+
+
+def event_features(event_totals):
+    """One row per game with the model features and its revenue, from store.event_totals rows"""
+    keys = GAME_KEYS + ['season', 'season_type', 'promotion', 'promotion_type']
+    games = event_totals.groupby(keys, as_index=False)[['revenue', 'seats']].sum()
+    seats = event_totals.pivot_table(index=GAME_KEYS, columns='customer_type', values='seats', aggfunc='sum')
+    seats = seats.reindex(columns=['Planner', 'In-Between', 'Last-Minute'], fill_value=0).fillna(0)
+    mix = seats.div(seats.sum(axis=1), axis=0).add_prefix('mix_').reset_index()
+
+    games = games.merge(mix, on=GAME_KEYS, how='left')
+    games['weekday'] = games['event_date'].dt.day_name()
+    games['promotion'] = games['promotion'].astype(float)
+    return games
+
+
+def design_matrix(features, columns, numeric_fill):
+    """Sparse CSR design matrix for `features` using the fitted column vocabulary"""
+    from scipy import sparse
+
+    n = len(features)
+    rows, cols = [], []
+    for name in CATEGORICAL_FEATURES:
+        index = (f"{name}=" + features[name].astype(str)).map(columns).fillna(-1).to_numpy(dtype=int)
+        known = index >= 0  # levels unseen in training contribute no effect
+        rows.append(np.flatnonzero(known))
+        cols.append(index[known])
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    onehot = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, len(columns)))
+
+    numeric = features.reindex(columns=NUMERIC_FEATURES).fillna(numeric_fill).to_numpy(dtype=float)
+    numeric_cols = [columns[name] for name in NUMERIC_FEATURES]
+    dense_part = sparse.csr_matrix(
+        (numeric.ravel(), (np.repeat(np.arange(n), len(numeric_cols)), np.tile(numeric_cols, n))),
+        shape=(n, len(columns)),
+    )
+    return (onehot + dense_part).tocsr()
+
+
+def fit_demand_model(features, alpha=ALPHA):
+    """Fit per-game revenue; returns coefficients, intercept and the encoding needed to predict"""
+    from scipy.sparse.linalg import LinearOperator, lsqr
+
+    levels = [f"{name}={level}" for name in CATEGORICAL_FEATURES for level in sorted(features[name].astype(str).unique())]
+    columns = {name: i for i, name in enumerate(levels + NUMERIC_FEATURES)}
+    numeric_fill = features[NUMERIC_FEATURES].mean()
+
+    X = design_matrix(features, columns, numeric_fill)
+    y = features['revenue'].to_numpy(dtype=float)
+    x_mean = np.asarray(X.mean(axis=0)).ravel()
+    y_mean = y.mean()
+
+    # Centered design (X - 1·x_mean) as an operator, so the intercept is left unpenalized
+    centered = LinearOperator(
+        X.shape,
+        matvec=lambda v: X @ v - x_mean @ v,
+        rmatvec=lambda u: X.T @ u - x_mean * u.sum(),
+    )
+    coef = lsqr(centered, y - y_mean, damp=np.sqrt(alpha), atol=1e-10, btol=1e-10)[0]
+    intercept = y_mean - x_mean @ coef
+
+    resid = y - (X @ coef + intercept)
+    return {
+        'coef': pd.Series(coef, index=list(columns)),
+        'intercept': intercept,
+        'columns': columns,
+        'numeric_fill': numeric_fill,
+        'alpha': alpha,
+        'r_squared': 1 - (resid @ resid) / ((y - y_mean) @ (y - y_mean)),
+        'n_games': len(y),
+    }
+
+
+def effects(model, feature):
+    """Coefficients of one categorical feature, largest first"""
+    coef = model['coef']
+    prefix = f"{feature}="
+    out = coef[coef.index.str.startswith(prefix)]
+    out.index = out.index.str[len(prefix):]
+    return out.sort_values(ascending=False)
+
+
+def predict(model, schedule):
+    """
+    Predicted revenue per game for a schedule with `event_date` and `opponent` (and optionally
+    `season_type`, `promotion` and days-out mix); missing mix uses the training average
+    """
+    schedule = schedule.copy()
+    schedule['event_date'] = pd.to_datetime(schedule['event_date'])
+    schedule['weekday'] = schedule['event_date'].dt.day_name()
+    if 'season_type' not in schedule:
+        schedule['season_type'] = 'Regular'
+    if 'promotion' in schedule:
+        schedule['promotion'] = schedule['promotion'].astype(float)
+    X = design_matrix(schedule, model['columns'], model['numeric_fill'])
+    return pd.Series(X @ model['coef'].to_numpy() + model['intercept'], index=schedule.index)
+
+
+def read_schedule(path):
+    """Upcoming games CSV with `Event Date`, `Away Team` and optional `Season Type` / `Giveaway` columns"""
+    raw = pd.read_csv(path)
+    schedule = pd.DataFrame({
+        'event_date': pd.to_datetime(raw['Event Date'], format='%m/%d/%Y'),
+        'opponent': raw['Away Team'],
+    })
+    if 'Season Type' in raw:
+        schedule['season_type'] = raw['Season Type']
+    if 'Giveaway' in raw:
+        schedule['promotion'] = raw['Giveaway'].notna()
+    return schedule
+
+
+def main():
+    import strykers_store as store
+    from strykers_metrics import MetricGraph
+
+    parser = argparse.ArgumentParser(description="Per-game revenue demand model")
+    parser.add_argument('schedule', nargs='?', help="Upcoming games CSV to predict")
+    parser.add_argument('--alpha', type=float, default=ALPHA, help="Ridge penalty")
+    args = parser.parse_args()
+
+    with closing(store.open_store()) as conn:
+        model = MetricGraph(conn, demand_alpha=args.alpha)['demand_model']
+
+    print(f"Games: {model['n_games']}  R-squared: {model['r_squared']:.2%}  alpha: {model['alpha']:g}")
+    for feature in ['weekday', 'opponent']:
+        print(f"\n{feature.title()} effects ($/game):")
+        print(effects(model, feature).map('{:+,.0f}'.format).to_string())
+
+    if args.schedule:
+        schedule = read_schedule(args.schedule)
+        schedule['predicted_revenue'] = predict(model, schedule)
+        print("\nPredicted revenue:")
+        print(schedule.to_string(index=False, formatters={'predicted_revenue': '${:,.0f}'.format}))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+SoCal Strykers Transaction Ingest
+Loads the secondary ticket CSV, cleans it and applies revenue normalization
+(returns netted out, fees normalized, promotion games tagged), caching the result
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+DATA_PATHS = [
+    'data.csv',
+    '/mnt/user-data/uploads/SoCal_Strykers_Secondary_Ticket_Sales_Secondary_Tix_Transaction_Data_.csv',
+]
+
+CACHE_DIR = '.cache'
+# Bump whenever the cleaned columns change so stale caches are rebuilt
+CACHE_VERSION = 3
+
+# ASSUMPTION, not sourced: fee share on top of the face price, used only when fee-inclusive
+# rows exist but the rate cannot be measured from them (see fee_rate). data.csv has no
+# fee-inclusive rows, so fee normalization is currently a no-op.
+ASSUMED_FEE_RATE = 0.15
+
+# Section tiers from the stadium map (stadium_map.png)
+GOAL_LINE_SECTIONS = {'F', 'G', 'H', 'J', 'K', 'QQ', 'RR', 'SS', 'TT'}
+OCEAN_CLUB_SECTIONS = {'Q', 'R', 'S', 'T'}
+SIDELINE_SECTIONS = {'A', 'B', 'C', 'D', 'E', 'L', 'M', 'N', 'O', 'P'}
+
+
+def find_data_file():
+    """Return the first transaction CSV found in the known locations"""
+    for path in DATA_PATHS:
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError("Could not find data.csv. Please run this script from the directory containing data.csv")
+
+
+def parse_currency(series):
+    """Convert '$1,234.56' strings to floats"""
+    return series.str.replace('$', '', regex=False).str.replace(',', '', regex=False).astype(float)
+
+
+def fee_rate(ticket_price, seats, block_price, fees_included):
+    """
+    Fee share on fee-inclusive rows, measured as Total Block Price over Ticket Price x seats.
+    Returns (rate, measured); falls back to ASSUMED_FEE_RATE when it cannot be measured.
+    """
+    face = (ticket_price * seats)[fees_included].sum()
+    if face > 0:
+        rate = block_price[fees_included].sum() / face - 1
+        if rate > 0.001:
+            return rate, True
+    return ASSUMED_FEE_RATE, False
+
+
+def section_tier(section):
+    """Map the `Section` column to the stadium map's pricing tiers"""
+    code = section.str.split().str[-1]
+    return pd.Series(
+        np.select(
+            [
+                section == 'Pitchside',
+                code.isin(SIDELINE_SECTIONS),
+                code.isin(OCEAN_CLUB_SECTIONS),
+                code.isin(GOAL_LINE_SECTIONS),
+            ],
+            ['Pitchside', 'Lower_Sideline', 'Ocean_Club', 'Lower_Goal_Line'],
+            default='Upper',
+        ),
+        index=section.index,
+    )
+
+
+def customer_type(days):
+    """Vectorized purchase-timing segments (Planner 15+, In-Between 3-14, Last-Minute 0-2 days)"""
+    return pd.Series(
+        np.select(
+            [days.isna(), days >= 15, days >= 3],
+            ['Unknown', 'Planner', 'In-Between'],
+            default='Last-Minute',
+        ),
+        index=days.index,
+    )
+
+
+def clean_transactions(raw):
+    """Clean the raw CSV frame and add the normalized revenue columns"""
+    df = raw.loc[:, ~raw.columns.str.startswith('Unnamed')].copy()
+
+    df['Event_Date'] = pd.to_datetime(df['Event Date'], format='%m/%d/%Y', errors='coerce')
+    df['Sale_Date'] = pd.to_datetime(df['Sale Date'], format='%m/%d/%Y', errors='coerce')
+    df['Days_Before_Game'] = (df['Event_Date'] - df['Sale_Date']).dt.days
+    df['Customer_Type'] = customer_type(df['Days_Before_Game'])
+    df['Section_Tier'] = section_tier(df['Section'])
+
+    # Fee normalization: every price is expressed fee-exclusive. When the fee shows up only in
+    # the block total it is measured from the data and the per-seat price is already face value;
+    # otherwise both prices are assumed fee-inclusive at ASSUMED_FEE_RATE.
+    fees_included = (df['Fees Included'].astype(str).str.upper() == 'TRUE').to_numpy()
+    ticket_price = parse_currency(df['Ticket Price'])
+    block_price = parse_currency(df['Total Block Price'])
+    rate, measured = fee_rate(ticket_price, df['Number of Seats'], block_price, fees_included)
+    fee_divisor = np.where(fees_included, 1 + rate, 1.0)
+    df['Ticket_Price'] = ticket_price if measured else ticket_price / fee_divisor
+    df['Gross_Revenue'] = block_price / fee_divisor
+
+    # Returned blocks keep their row for auditing but contribute no revenue or seats
+    df['Is_Return'] = df['Return'].astype(str).str.upper() == 'TRUE'
+    df['Total_Revenue'] = df['Gross_Revenue'].where(~df['Is_Return'], 0.0)
+    df['Seats'] = df['Number of Seats'].where(~df['Is_Return'], 0)
+
+    # A game is a promotion game if any of its transactions carries a giveaway
+    df['Giveaway'] = df['Giveaway'].fillna('None')
+    has_giveaway = df['Giveaway'] != 'None'
+    df['Promotion'] = has_giveaway.groupby(df['Event_Date']).transform('any')
+    df['Promotion_Type'] = (
+        df['Giveaway'].where(has_giveaway).groupby(df['Event_Date']).transform('first').fillna('None')
+    )
+
+    return df
+
+
+def _cache_path(csv_path):
+    stat = os.stat(csv_path)
+    key = f"{os.path.basename(csv_path)}-{stat.st_size}-{stat.st_mtime_ns}-v{CACHE_VERSION}"
+    return os.path.join(CACHE_DIR, f"transactions-{key}.pkl")
+
+
+def load_transactions(csv_path=None, use_cache=True):
+    """Load cleaned transactions, reusing the on-disk cache when the CSV is unchanged"""
+    csv_path = csv_path or find_data_file()
+    cache_file = _cache_path(csv_path)
+
+    if use_cache and os.path.exists(cache_file):
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+
+    df = clean_transactions(pd.read_csv(csv_path))
+
+    if use_cache:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return df
+
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+SoCal Strykers Metric Graph
+Every dashboard metric is a node whose inputs are its parameter names: assumptions,
+the transaction store (`conn`) or other nodes. Nodes are evaluated lazily and memoized
+on disk under a key derived from METRICS_VERSION, their code, the source of the modules
+they call and their inputs' keys, so changing one assumption (e.g. take_rate) only
+recomputes the nodes downstream of it, and editing a helper module invalidates the nodes
+that use it. Sweeps share one in-memory memo across graphs.
+
+    python strykers_metrics.py --set take_rate=0.25
+    python strykers_metrics.py --sweep take_rate 0.2 0.25 0.3333
+"""
+
+import argparse
+import hashlib
+import inspect
+import os
+import pickle
+from contextlib import closing
+
+import strykers_demand as demand
+import strykers_regression as regression
+import strykers_store as store
+import strykers_trends as trends
+
+METRIC_CACHE_DIR = os.path.join('.cache', 'metrics')
+# Bump to invalidate every cached metric (e.g. after changing code the keys cannot see)
+METRICS_VERSION = 1
+
+# Assumption leaves; override per run with MetricGraph(conn, take_rate=0.25, ...)
+ASSUMPTIONS = {
+    'total_games': 31,
+    'lastmin_target_ratio': 0.75,
+    'retention': 0.90,
+    'conversion_rate': 0.20,
+    'avg_attendance': 1922,
+    'eligible_pct': 0.798,
+    'take_rate': 1/3,
+    'upgrade_price': 10,
+    'demand_alpha': demand.ALPHA,
+}
+
+NODES = {}
+# Node name -> modules whose code it calls; their source is part of its cache key
+NODE_USES = {}
+
+
+def metric(func=None, *, uses=()):
+    """
+    Register a metric node; its parameter names are its inputs.
+    Use @metric(uses=[module, ...]) for nodes that call into other modules.
+    """
+    def register(func):
+        NODES[func.__name__] = func
+        NODE_USES[func.__name__] = tuple(uses)
+        return func
+    return register(func) if func is not None else register
+
+
+# Data nodes (read from the transaction store)
+
+@metric(uses=[store])
+def baseline(conn):
+    revenue, seats, games = store.totals(conn)
+    return {'revenue': revenue, 'seats': seats, 'atp': revenue / seats, 'games': games}
+
+
+@metric(uses=[store])
+def customer_types(conn):
+    return {
+        ctype: {'revenue': revenue, 'seats': seats, 'atp': revenue / seats}
+        for ctype, (revenue, seats) in store.by_customer_type(conn).items()
+    }
+
+
+@metric(uses=[store])
+def returns(conn):
+    blocks, revenue = store.returns(conn)
+    return {'blocks': blocks, 'revenue': revenue}
+
+
+@metric(uses=[store])
+def promotion(conn):
+    by_status, by_type = store.promotion_summary(conn)
+    return {
+        'by_status': by_status,
+        'by_type': by_type,
+        'promo_atp': by_status.loc[True, 'ATP'],
+        'non_promo_atp': by_status.loc[False, 'ATP'],
+        'promo_games': int(by_status.loc[True, 'Games']),
+        'non_promo_games': int(by_status.loc[False, 'Games']),
+        'atp_lift': by_status.loc[True, 'ATP'] / by_status.loc[False, 'ATP'] - 1,
+    }
+
+
+@metric(uses=[store, regression])
+def price_model(conn):
+    return regression.fit_price_model(store.read_transactions(conn))
+
+
+@metric(uses=[store, trends])
+def sale_date_trends(conn):
+    daily = trends.daily_series(store.daily_totals(conn, 'sale_date'))
+    return {'daily': daily, 'rolling': trends.rolling_metrics(daily)}
+
+
+@metric(uses=[store, trends])
+def event_date_trends(conn):
+    daily = trends.daily_series(store.daily_totals(conn, 'event_date'))
+    return {'daily': daily, 'rolling': trends.rolling_metrics(daily)}
+
+
+@metric(uses=[store, trends])
+def sell_through(conn):
+    return trends.sell_through(store.daily_totals(conn, 'sale_date'))
+
+
+@metric(uses=[store, trends])
+def seasons(conn):
+    return trends.season_comparison(store.season_totals(conn))
+
+
+@metric(uses=[store, demand])
+def event_features(conn):
+    return demand.event_features(store.event_totals(conn))
+
+
+@metric(uses=[demand])
+def demand_model(event_features, demand_alpha):
+    return demand.fit_demand_model(event_features, alpha=demand_alpha)
+
+
+# Initiatives
+
+@metric
+def initiative_1(customer_types, lastmin_target_ratio, retention):
+    """Last-Minute discount reduction"""
+    lastmin = customer_types['Last-Minute']
+    target_atp = customer_types['Planner']['atp'] * lastmin_target_ratio
+    new_seats = lastmin['seats'] * retention
+    new_revenue = new_seats * target_atp
+    return {
+        'target_atp': target_atp,
+        'new_seats': new_seats,
+        'new_revenue': new_revenue,
+        'revenue_change': new_revenue - lastmin['revenue'],
+    }
+
+
+@metric
+def initiative_2(customer_types, conversion_rate):
+    """Customer conversion: In-Between -> Planner (A) and Last-Minute -> In-Between (B)"""
+    planner, inbetween, lastmin = (customer_types[t] for t in ('Planner', 'In-Between', 'Last-Minute'))
+    seats_converting_a = inbetween['seats'] * conversion_rate
+    atp_increase_a = planner['atp'] - inbetween['atp']
+    seats_converting_b = lastmin['seats'] * conversion_rate
+    atp_increase_b = inbetween['atp'] - lastmin['atp']
+    return {
+        'seats_converting_a': seats_converting_a,
+        'atp_increase_a': atp_increase_a,
+        'revenue_increase_a': seats_converting_a * atp_increase_a,
+        'seats_converting_b': seats_converting_b,
+        'atp_increase_b': atp_increase_b,
+        'revenue_increase_b': seats_converting_b * atp_increase_b,
+        'revenue_change': seats_converting_a * atp_increase_a + seats_converting_b * atp_increase_b,
+    }
+
+
+@metric
+def initiative_3(avg_attendance, eligible_pct, take_rate, upgrade_price, total_games):
+    """Halftime seat upgrades"""
+    eligible_per_game = avg_attendance * eligible_pct
+    upgrades_per_game = eligible_per_game * take_rate
+    revenue_per_game = upgrades_per_game * upgrade_price
+    return {
+        'eligible_per_game': eligible_per_game,
+        'upgrades_per_game': upgrades_per_game,
+        'revenue_per_game': revenue_per_game,
+        'revenue_change': revenue_per_game * total_games,
+    }
+
+
+# Totals
+
+@metric
+def total_increase(initiative_1, initiative_2, initiative_3):
+    return initiative_1['revenue_change'] + initiative_2['revenue_change'] + initiative_3['revenue_change']
+
+
+@metric
+def new_revenue(baseline, total_increase):
+    return baseline['revenue'] + total_increase
+
+
+def _digest(*parts):
+    return hashlib.sha256('\x1f'.join(parts).encode()).hexdigest()[:20]
+
+
+_MODULE_DIGESTS = {}
+
+
+def _module_digest(module):
+    if module.__name__ not in _MODULE_DIGESTS:
+        _MODULE_DIGESTS[module.__name__] = _digest(module.__name__, inspect.getsource(module))
+    return _MODULE_DIGESTS[module.__name__]
+
+
+class MetricGraph:
+    """
+    Lazy, memoized evaluation of NODES for one store and one set of assumptions.
+    Pass the same `memo` dict to several graphs (e.g. a sweep) to share evaluated nodes;
+    with cache_dir=None and no shared memo every node is evaluated fresh.
+    """
+
+    def __init__(self, conn, cache_dir=METRIC_CACHE_DIR, memo=None, **overrides):
+        unknown = set(overrides) - set(ASSUMPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown assumptions: {', '.join(sorted(unknown))}")
+        self.conn = conn
+        self.cache_dir = cache_dir
+        self.assumptions = {**ASSUMPTIONS, **overrides}
+        self.memo = {} if memo is None else memo
+        self.computed = []
+        self._keys = {'conn': _digest('conn', store.source_key(conn))}
+
+    def key(self, name):
+        """Cache key of an input: its value for assumptions, else its code, used modules and inputs' keys"""
+        if name not in self._keys:
+            if name in self.assumptions:
+                self._keys[name] = _digest(name, repr(self.assumptions[name]))
+            else:
+                func = NODES[name]
+                inputs = inspect.signature(func).parameters
+                self._keys[name] = _digest(
+                    name, str(METRICS_VERSION), inspect.getsource(func),
+                    *(_module_digest(module) for module in NODE_USES[name]),
+                    *(self.key(i) for i in inputs),
+                )
+        return self._keys[name]
+
+    def __getitem__(self, name):
+        if name == 'conn':
+            return self.conn
+        if name in self.assumptions:
+            return self.assumptions[name]
+
+        key = self.key(name)
+        if key in self.memo:
+            return self.memo[key]
+
+        path = os.path.join(self.cache_dir, f"{name}-{key}.pkl") if self.cache_dir else None
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        else:
+            func = NODES[name]
+            value = func(*(self[i] for i in inspect.signature(func).parameters))
+            self.computed.append(name)
+            if path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(path, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.memo[key] = value
+        return value
+
+
+def _parse_assignment(text):
+    name, _, value = text.partition('=')
+    return name, float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate dashboard metrics under changed assumptions")
+    parser.add_argument('--set', action='append', default=[], type=_parse_assignment,
+                        metavar='NAME=VALUE', help="Override an assumption")
+    parser.add_argument('--sweep', nargs='+', metavar=('NAME', 'VALUE'), help="Assumption and values to sweep")
+    args = parser.parse_args()
+
+    overrides = dict(args.set)
+    runs = [overrides]
+    if args.sweep:
+        name, values = args.sweep[0], args.sweep[1:]
+        runs = [{**overrides, name: float(value)} for value in values]
+
+    memo = {}
+    with closing(store.open_store()) as conn:
+        for run in runs:
+            graph = MetricGraph(conn, memo=memo, **run)
+            increase = graph['total_increase']
+            revenue = graph['new_revenue']
+            label = ', '.join(f"{k}={v:g}" for k, v in run.items()) or 'defaults'
+            print(f"{label}: +${increase:,.2f} -> ${revenue:,.2f}  (computed: {', '.join(graph.computed) or 'none'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+SoCal Strykers Price Regression
+Ordinary least squares on per-seat ticket price with purchase-timing, seating and
+promotion dummies plus the timing x seating interactions shown on the dashboard
+"""
+
+import math
+
+import numpy as np
+
+# (term name, builder) in display order; builders take the cleaned transaction frame
+MODEL_TERMS = [
+    ('Intercept', lambda d: np.ones(len(d))),
+    ('In-Between', lambda d: d['Customer_Type'] == 'In-Between'),
+    ('Last-Minute', lambda d: d['Customer_Type'] == 'Last-Minute'),
+    # Ocean Club sits between the goal-line and sideline price points; it is grouped with goal line
+    ('Lower_Goal_Line', lambda d: d['Section_Tier'].isin(['Lower_Goal_Line', 'Ocean_Club'])),
+    ('Lower_Sideline', lambda d: d['Section_Tier'] == 'Lower_Sideline'),
+    ('Pitchside', lambda d: d['Section_Tier'] == 'Pitchside'),
+    ('Promotion', lambda d: d['Promotion']),
+    ('Last-Minute × Lower_Sideline', lambda d: (d['Customer_Type'] == 'Last-Minute') & (d['Section_Tier'] == 'Lower_Sideline')),
+    ('Last-Minute × Pitchside', lambda d: (d['Customer_Type'] == 'Last-Minute') & (d['Section_Tier'] == 'Pitchside')),
+    ('In-Between × Pitchside', lambda d: (d['Customer_Type'] == 'In-Between') & (d['Section_Tier'] == 'Pitchside')),
+]
+
+
+def _normal_sf(z):
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _f_sf(f_stat, df_model):
+    """Upper-tail F probability for a large residual df (chi-square limit, Wilson-Hilferty)"""
+    k = df_model
+    x = f_stat * k
+    z = ((x / k) ** (1 / 3) - (1 - 2 / (9 * k))) / math.sqrt(2 / (9 * k))
+    return _normal_sf(z)
+
+
+def format_p_value(p):
+    """Format a p-value with significance stars"""
+    stars = '***' if p < 0.001 else '**' if p < 0.01 else '*' if p < 0.05 else ''
+    text = '< 0.001' if p < 0.001 else f"{p:.3f}"
+    return f"{text} {stars}".strip()
+
+
+def fit_price_model(df):
+    """
+    Fit the dashboard price model on sold (non-returned) seats with a known customer type.
+    The sample is large, so coefficient p-values use the normal approximation to t.
+    """
+    sample = df[(df['Customer_Type'] != 'Unknown') & ~df['Is_Return']]
+    X = np.column_stack([np.asarray(build(sample), dtype=float) for _, build in MODEL_TERMS])
+    y = sample['Ticket_Price'].to_numpy(dtype=float)
+
+    n, p = X.shape
+    coef, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+    resid = y - X @ coef
+    ss_res = resid @ resid
+    ss_tot = ((y - y.mean()) ** 2).sum()
+
+    df_model = p - 1
+    df_resid = n - p
+    r_squared = 1 - ss_res / ss_tot
+    f_stat = ((ss_tot - ss_res) / df_model) / (ss_res / df_resid)
+
+    sigma2 = ss_res / df_resid
+    std_err = np.sqrt(np.diag(np.linalg.pinv(X.T @ X)) * sigma2)
+    t_stat = coef / std_err
+    p_values = [2 * _normal_sf(abs(t)) for t in t_stat]
+
+    names = [name for name, _ in MODEL_TERMS]
+    return {
+        'coef': dict(zip(names, coef)),
+        'std_err': dict(zip(names, std_err)),
+        'p_values': dict(zip(names, p_values)),
+        'r_squared': r_squared,
+        'f_stat': f_stat,
+        'f_p_value': _f_sf(f_stat, df_model),
+        'n_obs': n,
+    }
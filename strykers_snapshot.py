@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+SoCal Strykers Golden-Output Harness
+Extracts every dashboard number into a flat snapshot, compares snapshots with tolerances,
+and diffs dashboard HTML section by section with the base64 image payloads skipped.
+
+    python strykers_snapshot.py record                 # write golden_snapshot.json from the current data
+    python strykers_snapshot.py check                  # store/metric-graph and pandas paths vs. golden,
+                                                       # incremental rolling windows vs. a full rebuild
+    python strykers_snapshot.py diff-html golden.html run_*.html
+"""
+
+import argparse
+import json
+import math
+import numbers
+import re
+import sys
+import tempfile
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+import strykers_store as store
+from strykers_ingest import load_transactions
+from strykers_metrics import MetricGraph
+from strykers_regression import MODEL_TERMS, fit_price_model
+from strykers_trends import DAILY_COLUMNS, rolling_metrics, rolling_update
+
+GOLDEN_PATH = 'golden_snapshot.json'
+
+# Relative / absolute tolerances for numeric comparisons
+REL_TOL = 1e-6
+ABS_TOL = 1e-6
+
+CUSTOMER_TYPES = ['Planner', 'In-Between', 'Last-Minute']
+
+IMAGE_PAYLOAD = re.compile(r'data:image/[a-z+]+;base64,[A-Za-z0-9+/=]+')
+SECTION_HEADING = re.compile(r'<h2[^>]*>(.*?)</h2>', re.S)
+TAG = re.compile(r'<[^>]+>')
+NUMBER = re.compile(r'[-+]?\d[\d,]*(?:\.\d+)?')
+
+
+def _flatten(prefix, values, out):
+    for key, value in values.items():
+        # numbers.Real covers numpy scalars (np.int64, np.float64); bools are not metrics
+        if isinstance(value, numbers.Real) and not isinstance(value, (bool, np.bool_)):
+            out[f"{prefix}.{key}"] = float(value)
+    return out
+
+
+def snapshot_from_graph(graph):
+    """Flat {name: value} snapshot of the metrics shown on the dashboard"""
+    snap = {}
+    _flatten('baseline', graph['baseline'], snap)
+    for ctype in CUSTOMER_TYPES:
+        _flatten(f"customer_types.{ctype}", graph['customer_types'][ctype], snap)
+    for name in ['initiative_1', 'initiative_2', 'initiative_3', 'returns', 'promotion']:
+        _flatten(name, graph[name], snap)
+    for season, values in graph['seasons'].iterrows():
+        _flatten(f"seasons.{season}", values.to_dict(), snap)
+    snap['total_increase'] = float(graph['total_increase'])
+    snap['new_revenue'] = float(graph['new_revenue'])
+
+    demand_model = graph['demand_model']
+    _flatten('demand_model', demand_model, snap)
+    _flatten('demand_model.coef', demand_model['coef'].to_dict(), snap)
+
+    model = graph['price_model']
+    _flatten('price_model', model, snap)
+    for stat in ['coef', 'std_err', 'p_values']:
+        _flatten(f"price_model.{stat}", model[stat], snap)
+    return snap
+
+
+# Golden keys the pandas path must reproduce
+FRAME_KEYS = (
+    [f"baseline.{k}" for k in ('revenue', 'seats', 'atp', 'games')]
+    + [f"customer_types.{c}.{k}" for c in CUSTOMER_TYPES for k in ('revenue', 'seats', 'atp')]
+    + ['returns.blocks', 'returns.revenue']
+    + [f"promotion.{k}" for k in ('promo_atp', 'non_promo_atp', 'promo_games', 'non_promo_games', 'atp_lift')]
+    + [f"price_model.{k}" for k in ('r_squared', 'f_stat', 'f_p_value', 'n_obs')]
+    + [f"price_model.{stat}.{term}" for stat in ('coef', 'std_err', 'p_values') for term, _ in MODEL_TERMS]
+)
+
+
+def snapshot_from_frame(df):
+    """The data-derived part of the snapshot computed directly in pandas (no store)"""
+    snap = {}
+    revenue, seats = df['Total_Revenue'].sum(), df['Seats'].sum()
+    _flatten('baseline', {'revenue': revenue, 'seats': seats, 'atp': revenue / seats,
+                          'games': df['Event_Date'].nunique()}, snap)
+    grouped = df.groupby('Customer_Type')[['Total_Revenue', 'Seats']].sum()
+    for ctype in CUSTOMER_TYPES:
+        revenue, seats = grouped.loc[ctype]
+        _flatten(f"customer_types.{ctype}", {'revenue': revenue, 'seats': seats, 'atp': revenue / seats}, snap)
+    returned = df[df['Is_Return']]
+    _flatten('returns', {'blocks': len(returned), 'revenue': returned['Gross_Revenue'].sum()}, snap)
+
+    games = df.groupby(['Event_Date', 'Promotion'])[['Total_Revenue', 'Seats']].sum().reset_index()
+    by_status = games.groupby('Promotion').agg(revenue=('Total_Revenue', 'sum'), seats=('Seats', 'sum'),
+                                               games=('Event_Date', 'size'))
+    atp = by_status['revenue'] / by_status['seats']
+    _flatten('promotion', {'promo_atp': atp[True], 'non_promo_atp': atp[False],
+                           'promo_games': by_status.loc[True, 'games'],
+                           'non_promo_games': by_status.loc[False, 'games'],
+                           'atp_lift': atp[True] / atp[False] - 1}, snap)
+
+    model = fit_price_model(df)
+    _flatten('price_model', model, snap)
+    for stat in ['coef', 'std_err', 'p_values']:
+        _flatten(f"price_model.{stat}", model[stat], snap)
+    return snap
+
+
+def compare_snapshots(expected, actual, rel_tol=REL_TOL, abs_tol=ABS_TOL):
+    """List of human-readable differences over the keys both snapshots share, plus missing keys"""
+    problems = [f"missing: {key}" for key in sorted(set(expected) - set(actual))]
+    for key in sorted(set(expected) & set(actual)):
+        if not math.isclose(expected[key], actual[key], rel_tol=rel_tol, abs_tol=abs_tol):
+            problems.append(f"{key}: expected {expected[key]!r}, got {actual[key]!r}")
+    return problems
+
+
+def rolling_update_problems():
+    """
+    Differences between incremental rolling_update and a full rolling_metrics rebuild when
+    days are appended after, prepended before or changed within a saved 60-day state
+    """
+    rng = np.random.default_rng(0)
+    days = pd.date_range('2021-01-01', periods=70, freq='D')
+    full = pd.DataFrame(rng.integers(0, 50, (len(days), len(DAILY_COLUMNS))).astype(float),
+                        index=days, columns=DAILY_COLUMNS)
+    saved = full.iloc[:60]
+    earlier_day = pd.DataFrame([[100.0] * len(DAILY_COLUMNS)], index=[days[0] - pd.Timedelta(days=1)],
+                               columns=DAILY_COLUMNS)
+    changed = full.copy()
+    changed.iloc[10] += 5
+    cases = {'append': full, 'prepend': pd.concat([earlier_day, saved]), 'changed earlier day': changed}
+
+    problems = []
+    for case, daily in cases.items():
+        with tempfile.TemporaryDirectory() as state_dir:
+            rolling_update(saved, 'check', state_dir=state_dir)
+            actual = rolling_update(daily, 'check', state_dir=state_dir)
+        expected = rolling_metrics(daily)
+        if not (actual.index.equals(expected.index) and actual.columns.equals(expected.columns)
+                and np.allclose(actual.to_numpy(), expected.to_numpy(), equal_nan=True)):
+            problems.append(f"{case}: incremental rolling windows differ from a full rebuild")
+    return problems
+
+
+def html_sections(html):
+    """
+    {heading: (text tokens, numbers, image count)} with base64 payloads stripped.
+    Content before the first <h2> is keyed as 'Header'.
+    """
+    html = IMAGE_PAYLOAD.sub('data:image', html)
+    headings = list(SECTION_HEADING.finditer(html))
+    bounds = [('Header', 0)] + [(TAG.sub('', m.group(1)).strip(), m.start()) for m in headings]
+
+    sections = {}
+    for (name, start), (_, end) in zip(bounds, bounds[1:] + [(None, len(html))]):
+        chunk = html[start:end]
+        text = TAG.sub(' ', chunk)
+        numbers = [float(n.replace(',', '')) for n in NUMBER.findall(text)]
+        words = NUMBER.sub('#', text).split()
+        sections[name] = (words, numbers, chunk.count('data:image'))
+    return sections
+
+
+def diff_html(expected_html, actual_html, rel_tol=REL_TOL, abs_tol=ABS_TOL):
+    """Section-by-section differences between two dashboards"""
+    expected, actual = html_sections(expected_html), html_sections(actual_html)
+    problems = [f"section missing: {name}" for name in expected if name not in actual]
+    problems += [f"unexpected section: {name}" for name in actual if name not in expected]
+
+    for name in expected:
+        if name not in actual:
+            continue
+        (words_a, numbers_a, images_a), (words_b, numbers_b, images_b) = expected[name], actual[name]
+        if words_a != words_b:
+            problems.append(f"[{name}] text differs")
+        if images_a != images_b:
+            problems.append(f"[{name}] {images_a} images expected, {images_b} found")
+        if len(numbers_a) != len(numbers_b):
+            problems.append(f"[{name}] {len(numbers_a)} numbers expected, {len(numbers_b)} found")
+            continue
+        for i, (a, b) in enumerate(zip(numbers_a, numbers_b)):
+            if not math.isclose(a, b, rel_tol=rel_tol, abs_tol=abs_tol):
+                problems.append(f"[{name}] number #{i}: expected {a:g}, got {b:g}")
+    return problems
+
+
+def _report(label, problems):
+    status = '✓' if not problems else '✗'
+    print(f"{status} {label}" + (f" ({len(problems)} differences)" if problems else ''))
+    for problem in problems:
+        print(f"    {problem}")
+    return not problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden-output checks for dashboard runs")
+    parser.add_argument('--golden', default=GOLDEN_PATH, help="Golden snapshot JSON")
+    parser.add_argument('--rel-tol', type=float, default=REL_TOL)
+    parser.add_argument('--abs-tol', type=float, default=ABS_TOL)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('record', help="Write the golden snapshot from the current data")
+    commands.add_parser('check', help="Compare the store and pandas paths against the golden snapshot")
+    html_cmd = commands.add_parser('diff-html', help="Diff dashboards against a reference dashboard")
+    html_cmd.add_argument('reference')
+    html_cmd.add_argument('runs', nargs='+')
+    args = parser.parse_args()
+    tolerances = {'rel_tol': args.rel_tol, 'abs_tol': args.abs_tol}
+
+    if args.command == 'diff-html':
+        with open(args.reference) as f:
+            reference = f.read()
+        ok = True
+        for path in args.runs:
+            with open(path) as f:
+                ok &= _report(path, diff_html(reference, f.read(), **tolerances))
+        sys.exit(0 if ok else 1)
+
+    # Bypass the on-disk metric cache so the check exercises a fresh evaluation
+    with closing(store.open_store()) as conn:
+        graph_snap = snapshot_from_graph(MetricGraph(conn, cache_dir=None))
+
+    if args.command == 'record':
+        with open(args.golden, 'w') as f:
+            json.dump(graph_snap, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"✓ Recorded {len(graph_snap)} values to {args.golden}")
+        return
+
+    with open(args.golden) as f:
+        golden = json.load(f)
+    frame_snap = snapshot_from_frame(load_transactions())
+    ok = _report('metric graph (SQLite store)', compare_snapshots(golden, graph_snap, **tolerances))
+    ok &= _report('pandas', compare_snapshots({k: golden[k] for k in FRAME_KEYS}, frame_snap, **tolerances))
+    ok &= _report('incremental rolling windows', rolling_update_problems())
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
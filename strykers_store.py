@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+SoCal Strykers Transaction Store
+Embedded SQLite database of cleaned transactions with indexes for ad-hoc slicing.
+
+Ingest once, then every report run reads through the prepared aggregate queries below:
+    python strykers_store.py ingest [data.csv] [--db strykers.db]
+    python strykers_store.py query --by section_tier --customer-type Last-Minute
+"""
+
+import argparse
+import os
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+from strykers_ingest import CACHE_VERSION, find_data_file, load_transactions
+
+DB_PATH = 'strykers.db'
+
+# DataFrame column -> store column
+COLUMNS = {
+    'Event_Date': 'event_date',
+    'Sale_Date': 'sale_date',
+    'Days_Before_Game': 'days_before_game',
+    'Customer_Type': 'customer_type',
+    'Away Team': 'opponent',
+    'Section': 'section',
+    'Section_Tier': 'section_tier',
+    'Row': 'row',
+    'Season': 'season',
+    'Season Type': 'season_type',
+    'Giveaway': 'giveaway',
+    'Promotion': 'promotion',
+    'Promotion_Type': 'promotion_type',
+    'Is_Return': 'is_return',
+    'Number of Seats': 'block_seats',
+    'Seats': 'seats',
+    'Ticket_Price': 'ticket_price',
+    'Gross_Revenue': 'gross_revenue',
+    'Total_Revenue': 'total_revenue',
+}
+
+INDEXED_COLUMNS = ['event_date', 'sale_date', 'section_tier', 'customer_type', 'opponent']
+
+# Columns that may appear in GROUP BY / WHERE of a slice query
+SLICE_COLUMNS = {
+    'event_date', 'sale_date', 'customer_type', 'opponent', 'section', 'section_tier',
+    'season', 'season_type', 'promotion', 'promotion_type',
+}
+
+
+def boolean(text):
+    value = str(text).strip().lower()
+    if value in ('1', 'true', 'yes'):
+        return 1
+    if value in ('0', 'false', 'no'):
+        return 0
+    raise ValueError(f"Expected true/false, got {text!r}")
+
+
+# Non-text slice columns and how to coerce a filter value to their stored type
+SLICE_TYPES = {'season': int, 'promotion': boolean}
+
+TOTALS_SQL = """
+    SELECT SUM(total_revenue), SUM(seats), COUNT(DISTINCT event_date)
+    FROM transactions
+"""
+
+BY_CUSTOMER_TYPE_SQL = """
+    SELECT customer_type, SUM(total_revenue), SUM(seats)
+    FROM transactions
+    WHERE customer_type != 'Unknown'
+    GROUP BY customer_type
+"""
+
+RETURNS_SQL = """
+    SELECT COUNT(*), COALESCE(SUM(gross_revenue), 0)
+    FROM transactions
+    WHERE is_return = 1
+"""
+
+PROMOTION_GAMES_SQL = """
+    SELECT event_date, promotion, promotion_type, SUM(total_revenue) AS total_revenue, SUM(seats) AS seats
+    FROM transactions
+    GROUP BY event_date, promotion, promotion_type
+"""
+
+# Daily totals on either date axis, with each season's first game for pacing curves
+DAILY_TOTALS_SQL = """
+    SELECT t.{date_column} AS date, t.season, t.customer_type,
+           SUM(t.total_revenue) AS revenue, SUM(t.seats) AS seats, o.opener
+    FROM transactions t
+    JOIN (SELECT season, MIN(event_date) AS opener FROM transactions GROUP BY season) o USING (season)
+    WHERE t.{date_column} IS NOT NULL
+    GROUP BY t.{date_column}, t.season, t.customer_type
+    ORDER BY t.{date_column}
+"""
+
+SEASON_TOTALS_SQL = """
+    SELECT t.season, t.customer_type, SUM(t.total_revenue) AS revenue, SUM(t.seats) AS seats, g.games
+    FROM transactions t
+    JOIN (SELECT season, COUNT(DISTINCT event_date) AS games FROM transactions GROUP BY season) g USING (season)
+    GROUP BY t.season, t.customer_type
+"""
+
+# One row per game and customer type (doubleheaders are separate games)
+EVENT_TOTALS_SQL = """
+    SELECT event_date, opponent, season, season_type, promotion, promotion_type, customer_type,
+           SUM(total_revenue) AS revenue, SUM(seats) AS seats
+    FROM transactions
+    GROUP BY event_date, opponent, season, season_type, promotion, promotion_type, customer_type
+    ORDER BY event_date, opponent
+"""
+
+
+def _csv_key(csv_path):
+    stat = os.stat(csv_path)
+    return f"{os.path.abspath(csv_path)}-{stat.st_size}-{stat.st_mtime_ns}-v{CACHE_VERSION}"
+
+
+def ingest(csv_path=None, db_path=DB_PATH):
+    """Load cleaned transactions into the store, replacing any previous contents"""
+    csv_path = csv_path or find_data_file()
+    df = load_transactions(csv_path)
+
+    table = df[list(COLUMNS)].rename(columns=COLUMNS)
+    table['event_date'] = table['event_date'].dt.strftime('%Y-%m-%d')
+    table['sale_date'] = table['sale_date'].dt.strftime('%Y-%m-%d')
+    table['row'] = table['row'].astype(str)
+
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        table.to_sql('transactions', conn, if_exists='replace', index=False)
+        for column in INDEXED_COLUMNS:
+            conn.execute(f"CREATE INDEX idx_transactions_{column} ON transactions ({column})")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('source', ?)", (_csv_key(csv_path),))
+        conn.execute("ANALYZE")
+
+    return len(table)
+
+
+def open_store(csv_path=None, db_path=DB_PATH):
+    """
+    Open the store, (re)ingesting first if it is missing or older than the CSV.
+    The caller owns the connection: use `with closing(open_store()) as conn:` or close it.
+    """
+    csv_path = csv_path or find_data_file()
+    source = None
+    if os.path.exists(db_path):
+        with closing(sqlite3.connect(db_path)) as conn:
+            source = source_key(conn)
+    if source != _csv_key(csv_path):
+        print(f"Ingesting {csv_path} into {db_path}...")
+        ingest(csv_path, db_path)
+    return sqlite3.connect(db_path)
+
+
+def source_key(conn):
+    """Identifier of the CSV (path, size, mtime) the store was ingested from, or None"""
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def read_transactions(conn):
+    """Row-level transactions as a DataFrame with the ingest column names"""
+    df = pd.read_sql_query("SELECT * FROM transactions", conn, parse_dates=['event_date', 'sale_date'])
+    df = df.rename(columns={v: k for k, v in COLUMNS.items()})
+    for column in ['Promotion', 'Is_Return']:
+        df[column] = df[column].astype(bool)
+    return df
+
+
+def totals(conn):
+    """(revenue, seats, games) across all transactions"""
+    return conn.execute(TOTALS_SQL).fetchone()
+
+
+def by_customer_type(conn):
+    """{customer_type: (revenue, seats)} for known customer types"""
+    return {ctype: (revenue, seats) for ctype, revenue, seats in conn.execute(BY_CUSTOMER_TYPE_SQL)}
+
+
+def returns(conn):
+    """(returned blocks, gross revenue removed)"""
+    return conn.execute(RETURNS_SQL).fetchone()
+
+
+def promotion_summary(conn):
+    """ATP and per-game revenue for promotion vs. non-promotion games, and by giveaway type"""
+    games = pd.read_sql_query(PROMOTION_GAMES_SQL, conn)
+    games['promotion'] = games['promotion'].astype(bool)
+
+    def summarize(groups):
+        out = groups[['total_revenue', 'seats']].sum()
+        out.columns = ['Total_Revenue', 'Seats']
+        out['Games'] = groups.size()
+        out['ATP'] = out['Total_Revenue'] / out['Seats']
+        out['Revenue_Per_Game'] = out['Total_Revenue'] / out['Games']
+        return out
+
+    by_status = summarize(games.groupby('promotion'))
+    by_type = summarize(games.groupby('promotion_type')).sort_values('ATP', ascending=False)
+    return by_status, by_type
+
+
+def daily_totals(conn, date_column='sale_date'):
+    """Revenue and seats per day, season and customer type on the `sale_date` or `event_date` axis"""
+    if date_column not in ('sale_date', 'event_date'):
+        raise ValueError(f"Unknown date axis: {date_column}")
+    return pd.read_sql_query(DAILY_TOTALS_SQL.format(date_column=date_column), conn)
+
+
+def season_totals(conn):
+    """Revenue, seats and games per season and customer type"""
+    return pd.read_sql_query(SEASON_TOTALS_SQL, conn)
+
+
+def event_totals(conn):
+    """Revenue and seats per game (event date and opponent) and customer type"""
+    return pd.read_sql_query(EVENT_TOTALS_SQL, conn, parse_dates=['event_date'])
+
+
+def slice_metrics(conn, by=(), **filters):
+    """
+    Revenue, seats and ATP for any slice, e.g.
+    slice_metrics(conn, by=['opponent'], customer_type='Last-Minute', season=2021)
+    """
+    by = list(by)
+    unknown = (set(by) | set(filters)) - SLICE_COLUMNS
+    if unknown:
+        raise ValueError(f"Cannot slice on: {', '.join(sorted(unknown))}")
+    filters = {column: SLICE_TYPES.get(column, str)(value) for column, value in filters.items()}
+
+    select = by + ['SUM(total_revenue) AS revenue', 'SUM(seats) AS seats',
+                   'SUM(total_revenue) * 1.0 / SUM(seats) AS atp']
+    sql = f"SELECT {', '.join(select)} FROM transactions"
+    if filters:
+        sql += " WHERE " + " AND ".join(f"{column} = ?" for column in filters)
+    if by:
+        sql += f" GROUP BY {', '.join(by)} ORDER BY {', '.join(by)}"
+    return pd.read_sql_query(sql, conn, params=list(filters.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SoCal Strykers transaction store")
+    parser.add_argument('--db', default=DB_PATH, help="SQLite database file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_cmd = commands.add_parser('ingest', help="Load cleaned transactions into the store")
+    ingest_cmd.add_argument('csv', nargs='?', help="Transaction CSV (default: data.csv)")
+
+    query_cmd = commands.add_parser('query', help="Revenue, seats and ATP for a slice")
+    query_cmd.add_argument('--by', nargs='*', default=[], help="Columns to group by")
+    for column in sorted(SLICE_COLUMNS):
+        query_cmd.add_argument(f"--{column.replace('_', '-')}", dest=column, type=SLICE_TYPES.get(column, str),
+                               help=f"Filter on {column}")
+
+    args = parser.parse_args()
+    if args.command == 'ingest':
+        rows = ingest(args.csv, args.db)
+        print(f"✓ Ingested {rows:,} transactions into {args.db}")
+    else:
+        filters = {column: getattr(args, column) for column in SLICE_COLUMNS if getattr(args, column) is not None}
+        with closing(open_store(db_path=args.db)) as conn:
+            print(slice_metrics(conn, by=args.by, **filters).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
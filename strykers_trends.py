@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+SoCal Strykers Trend Analytics
+Rolling 7/28-day ATP, volume and customer-type mix over `Sale Date` and `Event_Date`,
+season sell-through pacing and 2020 vs. 2021 comparisons, plus inline SVG charts.
+
+Rolling windows run on the aggregated daily series (one row per calendar day), using
+cumulative sums over a sorted date index: window total = cumsum[t] - cumsum[t - w].
+RollingWindows keeps only the last `max(windows)` cumulative sums between updates. The
+metric graph always uses rolling_metrics; rolling_update is the explicit incremental path,
+persisting state under .cache/rolling so a refresh that only adds days rolls just those forward:
+
+    python strykers_trends.py                      # roll both date axes forward from the store
+"""
+
+import argparse
+import html
+import os
+import pickle
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+import strykers_store as store
+
+WINDOWS = (7, 28)
+ROLLING_STATE_DIR = os.path.join('.cache', 'rolling')
+CUSTOMER_TYPES = ['Planner', 'In-Between', 'Last-Minute']
+
+# Daily value columns tracked by the rolling windows
+DAILY_COLUMNS = ['revenue', 'seats'] + [f"seats_{ctype}" for ctype in CUSTOMER_TYPES]
+
+
+def daily_series(totals):
+    """
+    Continuous daily frame (missing days filled with zeros) from store.daily_totals rows
+    of (date, season, customer_type, revenue, seats)
+    """
+    totals = totals.assign(date=pd.to_datetime(totals['date']))
+    daily = totals.groupby('date')[['revenue', 'seats']].sum()
+    by_type = totals.pivot_table(index='date', columns='customer_type', values='seats', aggfunc='sum')
+    for ctype in CUSTOMER_TYPES:
+        daily[f"seats_{ctype}"] = by_type[ctype] if ctype in by_type else 0.0
+    days = pd.date_range(daily.index.min(), daily.index.max(), freq='D')
+    return daily.reindex(days, fill_value=0.0).fillna(0.0)[DAILY_COLUMNS]
+
+
+class RollingWindows:
+    """Incremental trailing-window sums over a daily series"""
+
+    def __init__(self, windows=WINDOWS):
+        self.windows = tuple(windows)
+        self.last_date = None
+        self.days = 0
+        # Cumulative sums of the last max(windows) days seen
+        self._tail = np.zeros((0, len(DAILY_COLUMNS)))
+
+    def update(self, daily):
+        """Roll forward over the days after `last_date`; returns the window metrics for those days"""
+        if self.last_date is not None:
+            daily = daily[daily.index > self.last_date]
+            if not daily.empty:
+                days = pd.date_range(self.last_date + pd.Timedelta(days=1), daily.index.max(), freq='D')
+                daily = daily.reindex(days, fill_value=0.0)
+        if daily.empty:
+            return pd.DataFrame()
+
+        start = self._tail[-1] if len(self._tail) else np.zeros(len(DAILY_COLUMNS))
+        cumsum = np.vstack([self._tail, start + np.cumsum(daily[DAILY_COLUMNS].to_numpy(dtype=float), axis=0)])
+        first = self.days - len(self._tail)  # absolute day number of cumsum[0]
+        positions = np.arange(self.days, self.days + len(daily))
+
+        out = {}
+        for window in self.windows:
+            # Window total = cumsum[t] - cumsum[t - window], with nothing before day 0
+            before_pos = positions - window
+            before = np.where((before_pos >= 0)[:, None], cumsum[np.maximum(before_pos - first, 0)], 0.0)
+            sums = cumsum[positions - first] - before
+            revenue, seats = sums[:, 0], sums[:, 1]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[f"atp_{window}d"] = np.where(seats > 0, revenue / seats, np.nan)
+                for i, ctype in enumerate(CUSTOMER_TYPES, start=2):
+                    out[f"mix_{ctype}_{window}d"] = np.where(seats > 0, sums[:, i] / seats, np.nan)
+            out[f"revenue_{window}d"] = revenue
+            out[f"seats_{window}d"] = seats
+
+        self._tail = cumsum[-max(self.windows):]
+        self.days += len(daily)
+        self.last_date = daily.index.max()
+        return pd.DataFrame(out, index=daily.index)
+
+
+def rolling_metrics(daily, windows=WINDOWS):
+    """Rolling ATP, seats, revenue and customer-type mix for every day of `daily`"""
+    return RollingWindows(windows).update(daily)
+
+
+def rolling_update(daily, name, windows=WINDOWS, state_dir=ROLLING_STATE_DIR):
+    """
+    Rolling metrics for `daily`, reusing the saved RollingWindows state `name` when the days it
+    already covers are unchanged and still lead the series (only later days are rolled forward);
+    otherwise, e.g. after late sales land on an earlier date, the series is rebuilt and the
+    state replaced
+    """
+    path = os.path.join(state_dir, f"{name}.pkl")
+    state = None
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+
+    # Resume only if the saved days are exactly the leading days of `daily`: a day added
+    # before the saved start or changed within it invalidates every later cumulative sum
+    saved = state['daily'] if state is not None else None
+    resumable = (
+        state is not None
+        and state['windows'] == tuple(windows)
+        and daily.index[:len(saved)].equals(saved.index)
+        and np.array_equal(daily.iloc[:len(saved)].to_numpy(), saved.to_numpy())
+    )
+    if resumable:
+        roller = state['roller']
+        new_days = roller.update(daily)
+        rolling = pd.concat([state['rolling'], new_days]) if not new_days.empty else state['rolling']
+    else:
+        roller = RollingWindows(windows)
+        rolling = roller.update(daily)
+
+    os.makedirs(state_dir, exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump({'windows': tuple(windows), 'daily': daily, 'rolling': rolling, 'roller': roller}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    return rolling
+
+
+def sell_through(totals):
+    """
+    Season pacing on the sale-date axis: cumulative share of each season's seats sold,
+    indexed by days before that season's first game
+    """
+    totals = totals.assign(date=pd.to_datetime(totals['date']))
+    curves = {}
+    for season, rows in totals.groupby('season'):
+        opener = pd.Timestamp(rows['opener'].iloc[0])
+        daily = rows.groupby('date')['seats'].sum().sort_index()
+        share = daily.cumsum() / daily.sum()
+        share.index = (opener - share.index).days
+        curves[season] = share.groupby(level=0).last().sort_index(ascending=False)
+    pacing = pd.DataFrame(curves).sort_index(ascending=False).ffill().fillna(0.0)
+    pacing.index.name = 'days_before_opener'
+    return pacing
+
+
+def season_comparison(season_totals):
+    """Season-over-season ATP, seats, revenue and customer-type mix from store.season_totals rows"""
+    totals = season_totals.pivot_table(index='season', columns='customer_type', values='seats', aggfunc='sum').fillna(0)
+    summary = season_totals.groupby('season')[['revenue', 'seats']].sum()
+    summary['games'] = season_totals.groupby('season')['games'].max()
+    summary['atp'] = summary['revenue'] / summary['seats']
+    summary['revenue_per_game'] = summary['revenue'] / summary['games']
+    for ctype in CUSTOMER_TYPES:
+        summary[f"mix_{ctype}"] = totals.get(ctype, 0) / summary['seats']
+    summary.loc['change'] = summary.iloc[-1] / summary.iloc[0] - 1
+    return summary
+
+
+# Charts
+
+CHART_WIDTH, CHART_HEIGHT, CHART_PAD = 640, 260, 48
+CHART_COLORS = ['#00d9ff', '#ffd700', '#00ff88', '#ff6b6b']
+
+
+def svg_line_chart(series, title, value_format='{:,.2f}', x_label=None):
+    """
+    Inline SVG line chart of {label: pd.Series}; every point has a hover tooltip and
+    clicking a legend entry toggles its series
+    """
+    frame = pd.DataFrame(series)
+    x = np.arange(len(frame))
+    values = frame.to_numpy(dtype=float)
+    lo, hi = np.nanmin(values), np.nanmax(values)
+    hi = hi if hi > lo else lo + 1
+
+    def px(i):
+        return CHART_PAD + i * (CHART_WIDTH - 2 * CHART_PAD) / max(len(frame) - 1, 1)
+
+    def py(v):
+        return CHART_HEIGHT - CHART_PAD - (v - lo) * (CHART_HEIGHT - 2 * CHART_PAD) / (hi - lo)
+
+    labels = [i.strftime('%Y-%m-%d') if hasattr(i, 'strftime') else str(i) for i in frame.index]
+    parts = [
+        f'<svg class="trend-chart" viewBox="0 0 {CHART_WIDTH} {CHART_HEIGHT}" xmlns="http://www.w3.org/2000/svg">',
+        f'<text x="{CHART_WIDTH / 2}" y="20" text-anchor="middle" fill="#ffd700" font-size="14">{html.escape(title)}</text>',
+        f'<text x="{CHART_PAD - 6}" y="{py(hi) + 4:.1f}" text-anchor="end" fill="#ccc" font-size="10">{value_format.format(hi)}</text>',
+        f'<text x="{CHART_PAD - 6}" y="{py(lo) + 4:.1f}" text-anchor="end" fill="#ccc" font-size="10">{value_format.format(lo)}</text>',
+        f'<text x="{CHART_PAD}" y="{CHART_HEIGHT - CHART_PAD + 16}" fill="#ccc" font-size="10">{labels[0]}</text>',
+        f'<text x="{CHART_WIDTH - CHART_PAD}" y="{CHART_HEIGHT - CHART_PAD + 16}" text-anchor="end" fill="#ccc" font-size="10">{labels[-1]}</text>',
+    ]
+    if x_label:
+        parts.append(f'<text x="{CHART_WIDTH / 2}" y="{CHART_HEIGHT - 8}" text-anchor="middle" fill="#ccc" font-size="10">{html.escape(x_label)}</text>')
+
+    for n, label in enumerate(frame.columns):
+        color = CHART_COLORS[n % len(CHART_COLORS)]
+        column = values[:, n]
+        valid = ~np.isnan(column)
+        points = ' '.join(f"{px(i):.1f},{py(v):.1f}" for i, v in zip(x[valid], column[valid]))
+        dots = ''.join(
+            f'<circle cx="{px(i):.1f}" cy="{py(v):.1f}" r="2.5"><title>{labels[i]} · {html.escape(str(label))}: {value_format.format(v)}</title></circle>'
+            for i, v in zip(x[valid], column[valid])
+        )
+        parts.append(
+            f'<g class="series" fill="{color}"><polyline points="{points}" fill="none" stroke="{color}" stroke-width="1.5"/>{dots}</g>'
+        )
+        parts.append(
+            f'<text class="legend" x="{CHART_PAD + n * 150}" y="40" fill="{color}" font-size="11" style="cursor:pointer" '
+            f'onclick="var s=this.parentNode.querySelectorAll(\'.series\')[{n}];s.style.display=s.style.display===\'none\'?\'\':\'none\'">'
+            f'■ {html.escape(str(label))}</text>'
+        )
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll the saved 7/28-day windows forward from the store")
+    parser.add_argument('--axis', choices=['sale_date', 'event_date'], nargs='*',
+                        default=['sale_date', 'event_date'], help="Date axes to update")
+    args = parser.parse_args()
+
+    with closing(store.open_store()) as conn:
+        for axis in args.axis:
+            rolling = rolling_update(daily_series(store.daily_totals(conn, axis)), axis)
+            latest = rolling.iloc[-1]
+            print(f"{axis}: {len(rolling)} days through {rolling.index[-1]:%Y-%m-%d}  "
+                  f"ATP 7d ${latest['atp_7d']:,.2f}  28d ${latest['atp_28d']:,.2f}")
+
+
+if __name__ == '__main__':
+    main()